@@ -4,105 +4,198 @@
 # Date: Apr 12 2024
 
 import sqlite3
+import threading
+import time
 import pytz
+from collections import defaultdict
 from datetime import datetime
 
 DATABASE_NAME = 'wheatley.db'
 
+# One connection shared for the life of the bot instead of reconnecting on every call.
+# The scheduler and discord event loop can hit this from different threads, so guard it with a lock.
+_conn = sqlite3.connect(DATABASE_NAME, check_same_thread=False, isolation_level=None, cached_statements=256)
+_lock = threading.Lock()
+_conn.execute('PRAGMA journal_mode=WAL')
+_conn.execute('PRAGMA synchronous=NORMAL')
+_conn.execute('PRAGMA temp_store=MEMORY')
+_conn.execute('PRAGMA cache_size=-20000')
+_conn.execute('PRAGMA busy_timeout=5000')
+
+# Hot queries kept as constants so the identical string hits sqlite3's statement cache every time
+SQL_CREATE_HABIT = 'INSERT INTO habits (user_id, habit_name, reminder_time) VALUES (?, ?, ?)'
+SQL_GET_HABITS = 'SELECT habit_name, streak, last_completed, reminder_time FROM habits WHERE user_id = ?'
+SQL_MARK_DONE = "UPDATE habits SET streak = streak + 1, last_completed = ?, completed = 1 WHERE user_id = ? AND habit_name = ?"
+SQL_RESET_STREAK = 'UPDATE habits SET streak = 0, last_completed = NULL WHERE user_id = ? AND habit_name = ?'
+SQL_DELETE_HABIT = 'DELETE FROM habits WHERE user_id = ? AND habit_name = ?'
+SQL_GET_ALL_HABITS = 'SELECT * from habits'
+SQL_GET_HABIT = 'SELECT habit_name, streak, last_completed, reminder_time FROM habits WHERE user_id = ? AND habit_name = ?'
+SQL_UPDATE_REMINDER = 'UPDATE habits SET reminder_time = ?, updated_at = ? WHERE user_id = ? AND habit_name = ?'
+SQL_GET_ALL_WITH_TIMES = 'SELECT user_id, habit_name, reminder_time, streak FROM habits'
+SQL_GET_HABITS_DUE = 'SELECT user_id, habit_name FROM habits WHERE reminder_time = ?'
+SQL_GET_AIRCRAFT_MODEL = 'SELECT model, fetched_at FROM ac_meta WHERE icao24 = ?'
+SQL_SAVE_AIRCRAFT_MODEL = 'INSERT OR REPLACE INTO ac_meta (icao24, model, fetched_at) VALUES (?, ?, ?)'
+
+def normalize_reminder_time(reminder_time):
+    # reminder times are stored as 4 digit 24hr time, so 9:45 and 945 both become 0945
+    return reminder_time.replace(':', '').strip().zfill(4)
+
 def create_habits_table():
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS habits (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT NOT NULL,
-            habit_name TEXT NOT NULL,
-            streak INTEGER DEFAULT 0,
-            last_completed DATETIME,
-            reminder_time TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            completed INTEGER DEFAULT 0
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS habits (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                habit_name TEXT NOT NULL,
+                streak INTEGER DEFAULT 0,
+                last_completed DATETIME,
+                reminder_time TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                completed INTEGER DEFAULT 0
+            )
+        ''')
+        # Every lookup/update filters on user_id + habit_name, index it so they seek instead of scanning the table
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_habits_user_habit ON habits(user_id, habit_name)')
+        # Lets the scheduler look up reminders due at a given time without reading every row
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_habits_reminder ON habits(reminder_time)')
 
 def create_habit(user_id, habit_name, reminder_time):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO habits (user_id, habit_name, reminder_time) VALUES (?, ?, ?)',
-                   (user_id, habit_name, reminder_time))
-    conn.commit()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_CREATE_HABIT,
+                       (user_id, habit_name, normalize_reminder_time(reminder_time)))
 
 def get_habits(user_id):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT habit_name, streak, last_completed, reminder_time FROM habits WHERE user_id = ?', (user_id,))
-    habits = cursor.fetchall()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_GET_HABITS, (user_id,))
+        habits = cursor.fetchall()
     return habits
 
 def mark_habit_completed(user_id, habit_name):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
     est = pytz.timezone('US/Eastern')
     now = datetime.now(est)
-    cursor.execute("UPDATE habits SET streak = streak + 1, last_completed = ?, completed = 1 WHERE user_id = ? AND habit_name = ?",
-                   (now, user_id, habit_name))
-    conn.commit()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_MARK_DONE,
+                       (now, user_id, habit_name))
 
 def reset_habit_streak(user_id, habit_name):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('UPDATE habits SET streak = 0, last_completed = NULL WHERE user_id = ? AND habit_name = ?',
-                   (user_id, habit_name))
-    conn.commit()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_RESET_STREAK,
+                       (user_id, habit_name))
 
 def delete_habit(user_id, habit_name):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM habits WHERE user_id = ? AND habit_name = ?', (user_id, habit_name))
-    conn.commit()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_DELETE_HABIT, (user_id, habit_name))
 
 def get_all_habits():
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT * from habits')
-    allhabits = cursor.fetchall()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_GET_ALL_HABITS)
+        allhabits = cursor.fetchall()
     return allhabits
 
 def get_habit(user_id, habit_name):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT habit_name, streak, last_completed, reminder_time FROM habits WHERE user_id = ? AND habit_name = ?', (user_id, habit_name))
-    habit = cursor.fetchone()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_GET_HABIT, (user_id, habit_name))
+        habit = cursor.fetchone()
     return habit
 
 
 def update_habit(user_id, habit_name, new_reminder_time):
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
     est = pytz.timezone('US/Eastern')
     now = datetime.now(est)
-    cursor.execute('UPDATE habits SET reminder_time = ?, updated_at = ? WHERE user_id = ? AND habit_name = ?', (new_reminder_time, now, user_id, habit_name))
-    conn.commit()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_UPDATE_REMINDER, (normalize_reminder_time(new_reminder_time), now, user_id, habit_name))
+
+def mark_habits_completed_bulk(pairs):
+    # pairs is a list of (user_id, habit_name), all updated in one transaction.
+    # each pair is applied once per occurrence, so a pair listed twice adds 2 to the streak
+    est = pytz.timezone('US/Eastern')
+    now = datetime.now(est)
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        # the connection commits on success and rolls back if anything raises
+        with _conn:
+            cursor.executemany(SQL_MARK_DONE,
+                               [(now, user_id, habit_name) for user_id, habit_name in pairs])
+
+def update_habits_bulk(updates):
+    # updates is a list of (user_id, habit_name, new_reminder_time), all updated in one transaction
+    est = pytz.timezone('US/Eastern')
+    now = datetime.now(est)
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        # the connection commits on success and rolls back if anything raises
+        with _conn:
+            cursor.executemany(SQL_UPDATE_REMINDER,
+                               [(normalize_reminder_time(new_reminder_time), now, user_id, habit_name) for user_id, habit_name, new_reminder_time in updates])
+
+def get_habits_for_users(user_ids):
+    # one SELECT for several users, returned as {user_id: [(habit_name, streak, last_completed, reminder_time), ...]}
+    user_ids = list(user_ids)
+    habits = defaultdict(list)
+    if not user_ids:
+        return habits
+    placeholders = ','.join('?' * len(user_ids))
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(f'SELECT user_id, habit_name, streak, last_completed, reminder_time FROM habits WHERE user_id IN ({placeholders})', user_ids)
+        rows = cursor.fetchall()
+    for user_id, *habit in rows:
+        habits[user_id].append(tuple(habit))
+    return habits
 
 def get_all_habits_with_times():
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT user_id, habit_name, reminder_time, streak FROM habits')
-    habits = cursor.fetchall()
-    conn.close()
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_GET_ALL_WITH_TIMES)
+        habits = cursor.fetchall()
+    return habits
+
+def get_habits_due(now_hhmm):
+    # habits whose reminder is set for the given 24hr time (eg 0945), uses idx_habits_reminder
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_GET_HABITS_DUE, (normalize_reminder_time(now_hhmm),))
+        habits = cursor.fetchall()
     return habits
 
+def create_aircraft_metadata_table():
+    # persistent cache of aircraft make/model, fetched_at lets callers re-check entries that came back unknown
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ac_meta (
+                icao24 TEXT PRIMARY KEY,
+                model TEXT,
+                fetched_at INT
+            )
+        ''')
+
+def get_aircraft_model(icao24):
+    # returns (model, fetched_at) or None if the aircraft hasn't been looked up yet
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_GET_AIRCRAFT_MODEL, (icao24,))
+        row = cursor.fetchone()
+    return row
+
+def save_aircraft_model(icao24, model):
+    with _lock:
+        cursor = _conn.cursor()
+        cursor.execute(SQL_SAVE_AIRCRAFT_MODEL, (icao24, model, int(time.time())))
+
 
-# Initialize the database table if it doesn't exist
+# Initialize the database tables if they don't exist
 create_habits_table()
+create_aircraft_metadata_table()
@@ -1,75 +1,165 @@
 import requests
+from requests.adapters import HTTPAdapter
 import math
+import numpy as np
+import orjson
+try:
+    import numba
+except ImportError:
+    numba = None
 import json
 import os
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 
-# Dictionary to decode the aircraft category from the state vector.
+import database
+
+# Tuple to decode the aircraft category from the state vector, indexed by category code.
 # Based on the official OpenSky Network documentation and common ADS-B standards.
-AIRCRAFT_CATEGORIES = {
-    0: 'No information',
-    1: 'No ADS-B Emitter Category Information',
-    2: 'Light (< 15500 lbs)',
-    3: 'Small (15500 to 75000 lbs)',
-    4: 'Large (75000 to 300000 lbs)',
-    5: 'High-Vortex Large',
-    6: 'Heavy (> 300000 lbs)',
-    7: 'High-Performance',
-    8: 'Rotorcraft',
-    9: 'Glider / sailplane',
-    10: 'Lighter-than-air',
-    11: 'Parachutist / Skydiver',
-    12: 'Ultralight / hang-glider / paraglider',
-    13: 'Reserved',
-    14: 'Unmanned Aerial Vehicle',
-    15: 'Space / Trans-atmospheric vehicle',
-    16: 'Surface Vehicle – Emergency Vehicle',
-    17: 'Surface Vehicle – Service Vehicle',
-    18: 'Point Obstacle',
-    19: 'Cluster Obstacle',
-    20: 'Line Obstacle'
-}
-
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+AIRCRAFT_CATEGORIES = (
+    'No information',                        # 0
+    'No ADS-B Emitter Category Information', # 1
+    'Light (< 15500 lbs)',                   # 2
+    'Small (15500 to 75000 lbs)',            # 3
+    'Large (75000 to 300000 lbs)',           # 4
+    'High-Vortex Large',                     # 5
+    'Heavy (> 300000 lbs)',                  # 6
+    'High-Performance',                      # 7
+    'Rotorcraft',                            # 8
+    'Glider / sailplane',                    # 9
+    'Lighter-than-air',                      # 10
+    'Parachutist / Skydiver',                # 11
+    'Ultralight / hang-glider / paraglider', # 12
+    'Reserved',                              # 13
+    'Unmanned Aerial Vehicle',               # 14
+    'Space / Trans-atmospheric vehicle',     # 15
+    'Surface Vehicle – Emergency Vehicle',   # 16
+    'Surface Vehicle – Service Vehicle',     # 17
+    'Point Obstacle',                        # 18
+    'Cluster Obstacle',                      # 19
+    'Line Obstacle',                         # 20
+)
+
+# Below this many aircraft the numba kernel isn't worth it over plain NumPy.
+NUMBA_MIN_FLIGHTS = 64
+
+# Pulls the fields we use out of an OpenSky state vector in one call.
+# on_ground (8) is left out since grounded aircraft are filtered before the loop, and
+# category (17) is only present on some responses so it's read separately.
+_unpack_state = itemgetter(0, 1, 2, 4, 5, 6, 7, 9, 10)
+
+# How long an aircraft OpenSky has no metadata for stays 'Unknown Model' before we ask again.
+UNKNOWN_MODEL_RECHECK = 7 * 24 * 3600
+
+# How many aircraft metadata lookups to run at once.
+METADATA_WORKERS = 16
+
+# Shared session so every OpenSky call reuses pooled keep-alive connections instead of a new TLS handshake.
+# The pool is sized to the metadata workers so parallel lookups don't open connections only to discard them.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=METADATA_WORKERS))
+
+# The OAuth token is valid for 30 minutes, keep it around and only ask for a new one when it's about to expire.
+_token = {"value": None, "exp": 0}
+
+# OpenSky only refreshes positions every ~10 seconds, so a flights summary for the same area is
+# reused for a short while instead of fetching everything again. Keyed by rounded (lat, lon, radius).
+FLIGHT_CACHE_TTL = 15
+FLIGHT_CACHE_MAXSIZE = 128
+_flight_cache = {}
+
+@dataclass(frozen=True)
+class Observer:
     """
-    Calculate the distance between two points on Earth using the Haversine formula.
-    Returns distance in kilometers.
+    A fixed observing location with its trig values precomputed, so distance and
+    bearing to many aircraft don't redo the same work for the observer each time.
+    Accepts plain floats or NumPy arrays of coordinates.
     """
-    R = 6371  # Earth radius in kilometers
-
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-
-    dlon = lon2_rad - lon1_rad
-    dlat = lat2_rad - lat1_rad
-
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    distance = R * c
-    return distance
-
-def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    latitude: float
+    longitude: float
+    lat_rad: float = field(init=False)
+    lon_rad: float = field(init=False)
+    sin_lat: float = field(init=False)
+    cos_lat: float = field(init=False)
+
+    def __post_init__(self):
+        lat_rad = math.radians(self.latitude)
+        object.__setattr__(self, 'lat_rad', lat_rad)
+        object.__setattr__(self, 'lon_rad', math.radians(self.longitude))
+        object.__setattr__(self, 'sin_lat', math.sin(lat_rad))
+        object.__setattr__(self, 'cos_lat', math.cos(lat_rad))
+
+    def distance_and_bearing_to(self, lat2, lon2):
+        """
+        Haversine distance and initial bearing from the observer in one pass, sharing the
+        trig of the target coordinates.
+        Returns (distance in kilometers, bearing in degrees 0-360).
+        """
+        R = 6371  # Earth radius in kilometers
+
+        lat2_rad = np.radians(lat2)
+        sin_lat2 = np.sin(lat2_rad)
+        cos_lat2 = np.cos(lat2_rad)
+        dlat = lat2_rad - self.lat_rad
+        dlon = np.radians(lon2) - self.lon_rad
+
+        a = np.sin(dlat / 2)**2 + self.cos_lat * cos_lat2 * np.sin(dlon / 2)**2
+        distance = R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+        x = np.sin(dlon) * cos_lat2
+        y = self.cos_lat * sin_lat2 - (self.sin_lat * cos_lat2 * np.cos(dlon))
+        bearing = (np.degrees(np.arctan2(x, y)) + 360) % 360
+        return distance, bearing
+
+# Optional compiled kernel for big batches of aircraft. Without numba the NumPy version in Observer is used.
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _dist_brg(lat0, lon0, lats, lons, out_d, out_b):
+        """
+        Fused haversine distance (km) and bearing (degrees 0-360) from one point to many,
+        written into out_d and out_b.
+        """
+        R = 6371.0  # Earth radius in kilometers
+        lat0_rad = math.radians(lat0)
+        lon0_rad = math.radians(lon0)
+        sin_lat0 = math.sin(lat0_rad)
+        cos_lat0 = math.cos(lat0_rad)
+        for i in numba.prange(lats.shape[0]):
+            lat2_rad = math.radians(lats[i])
+            sin_lat2 = math.sin(lat2_rad)
+            cos_lat2 = math.cos(lat2_rad)
+            dlat = lat2_rad - lat0_rad
+            dlon = math.radians(lons[i]) - lon0_rad
+
+            a = math.sin(dlat / 2)**2 + cos_lat0 * cos_lat2 * math.sin(dlon / 2)**2
+            out_d[i] = R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+            x = math.sin(dlon) * cos_lat2
+            y = cos_lat0 * sin_lat2 - (sin_lat0 * cos_lat2 * math.cos(dlon))
+            out_b[i] = (math.degrees(math.atan2(x, y)) + 360) % 360
+
+# Suffixes for the aircraft type line.
+_HELI_EMOJI = ' 🚁'
+_PLANE_EMOJI = ' ✈️'
+
+# 16-point compass rose, starting at North and going clockwise.
+_DIRS = (
+    "North", "North-Northeast", "Northeast", "East-Northeast",
+    "East", "East-Southeast", "Southeast", "South-Southeast",
+    "South", "South-Southwest", "Southwest", "West-Southwest",
+    "West", "West-Northwest", "Northwest", "North-Northwest"
+)
+
+def _cardinal(d: float) -> str:
     """
-    Calculate the initial bearing from point A to point B.
-    Returns bearing in degrees (0-360).
+    degrees_to_cardinal for a bearing that is known to be set.
     """
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-
-    delta_lon = lon2_rad - lon1_rad
-
-    x = math.sin(delta_lon) * math.cos(lat2_rad)
-    y = math.cos(lat1_rad) * math.sin(lat2_rad) - (math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(delta_lon))
-
-    initial_bearing = math.atan2(x, y)
-    initial_bearing = math.degrees(initial_bearing)
-    compass_bearing = (initial_bearing + 360) % 360
-    return compass_bearing
+    # Each direction covers 360/16 = 22.5 degrees.
+    # We add half a direction to center the N direction around 0, and & 15 wraps around like % 16.
+    return _DIRS[int(d * (16 / 360) + 0.5) & 15]
 
 def degrees_to_cardinal(d: float | None) -> str:
     """
@@ -77,16 +167,7 @@ def degrees_to_cardinal(d: float | None) -> str:
     """
     if d is None:
         return "N/A"
-    dirs = [
-        "North", "North-Northeast", "Northeast", "East-Northeast",
-        "East", "East-Southeast", "Southeast", "South-Southeast",
-        "South", "South-Southwest", "Southwest", "West-Southwest",
-        "West", "West-Northwest", "Northwest", "North-Northwest"
-    ]
-    # Each direction covers 360/16 = 22.5 degrees.
-    # We add 11.25 to center the N direction around 0.
-    val = int((d + 11.25) / 22.5)
-    return dirs[val % 16]
+    return _cardinal(d)
 
 def get_flight_destination(icao24: str, last_contact_ts: int):
     """
@@ -98,54 +179,70 @@ def get_flight_destination(icao24: str, last_contact_ts: int):
     end = last_contact_ts + 43200    # 12 hours from now
     url = f"https://opensky-network.org/api/flights/aircraft?icao24={icao24}&begin={begin}&end={end}"
     try:
-        response = requests.get(url, timeout=5)
+        response = _session.get(url, timeout=5)
         response.raise_for_status()
-        flights = response.json()
+        flights = orjson.loads(response.content)
         if flights:
             return flights[-1].get('estArrivalAirport', 'N/A')
-    except requests.RequestException:
+    except (requests.RequestException, orjson.JSONDecodeError):
         return 'N/A' # Don't let a failure here stop the main process
     return 'N/A'
 
-def get_aircraft_metadata(icao24: str, cache: dict) -> str:
+@lru_cache(maxsize=4096)
+def _fetch_metadata(icao24: str, recheck_period: int) -> str:
+    """
+    Looks up the manufacturer and model for an aircraft, first in the persistent
+    ac_meta table and then from the OpenSky aircraft database. Results are memoized
+    in-process. Transient request failures raise instead of returning, so they are
+    neither memoized nor written to the database and get retried next time.
+
+    Aircraft OpenSky didn't know about are asked for again once their stored entry is
+    older than UNKNOWN_MODEL_RECHECK. recheck_period only changes once per that interval,
+    so it also ages those answers out of the in-process memo.
+    """
+    cached = database.get_aircraft_model(icao24)
+    if cached is not None:
+        model_info, fetched_at = cached
+        if model_info != 'Unknown Model' or time.time() - fetched_at < UNKNOWN_MODEL_RECHECK:
+            return model_info
+
+    url = f"https://opensky-network.org/api/metadata/aircraft/icao/{icao24}"
+    # This public metadata endpoint does not require authentication.
+    response = _session.get(url, timeout=5)
+    if response.status_code == 404:
+        model_info = 'Unknown Model'
+    else:
+        response.raise_for_status()
+        metadata = orjson.loads(response.content)
+
+        manufacturer = (metadata.get('manufacturerName') or '').strip()
+        model = (metadata.get('model') or '').strip()
+        model_info = f"{manufacturer} {model}".strip() if manufacturer or model else 'Unknown Model'
+
+    database.save_aircraft_model(icao24, model_info)
+    return model_info
+
+def get_aircraft_metadata(icao24: str) -> str:
     """
     Fetches aircraft metadata (manufacturer and model) from the OpenSky aircraft database.
-    Uses a cache to avoid redundant API calls for the same aircraft within a single run.
+    Lookups are cached in memory and in the bot's database, so each aircraft is only
+    fetched from the API once.
 
     Args:
         icao24 (str): The ICAO24 address of the aircraft.
-        cache (dict): A dictionary to cache results for the duration of the script run.
 
     Returns:
         str: A formatted string with manufacturer and model, or a fallback message.
     """
-    if icao24 in cache:
-        return cache[icao24]
-
-    url = f"https://opensky-network.org/api/metadata/aircraft/icao/{icao24}"
     try:
-        # This public metadata endpoint does not require authentication.
-        response = requests.get(url, timeout=5)
-        if response.status_code == 404:
-            cache[icao24] = 'Unknown Model'
-            return cache[icao24]
-        
-        response.raise_for_status()
-        metadata = response.json()
-        
-        manufacturer = (metadata.get('manufacturerName') or '').strip()
-        model = (metadata.get('model') or '').strip()
-
-        result = f"{manufacturer} {model}".strip() if manufacturer or model else 'Unknown Model'
-        cache[icao24] = result
-        return result
-    except requests.RequestException:
-        cache[icao24] = 'Metadata N/A'
-        return cache[icao24]
+        return _fetch_metadata(icao24, int(time.time() // UNKNOWN_MODEL_RECHECK))
+    except (requests.RequestException, orjson.JSONDecodeError):
+        return 'Metadata N/A'
 
 def get_oauth_token(client_id: str, client_secret: str) -> str | None:
     """
     Obtains an OAuth2 access token from the OpenSky Network authentication server.
+    The token is cached and reused until a minute before it expires.
 
     Args:
         client_id (str): Your OpenSky API client ID.
@@ -160,13 +257,30 @@ def get_oauth_token(client_id: str, client_secret: str) -> str | None:
         "client_id": client_id,
         "client_secret": client_secret,
     }
+    if _token["value"] and time.time() < _token["exp"] - 60:
+        return _token["value"]
+
     try:
-        response = requests.post(auth_url, data=payload, timeout=10)
+        response = _session.post(auth_url, data=payload, timeout=10)
         response.raise_for_status()  # Will raise an exception for 4xx/5xx status codes
         token_data = response.json()
-        return token_data.get("access_token")
     except requests.RequestException:
         return None
+    _token["value"] = token_data.get("access_token")
+    _token["exp"] = time.time() + token_data.get("expires_in", 1800)
+    return _token["value"]
+
+def _store_flight_result(key: tuple, result: str) -> None:
+    """
+    Saves a flight summary in the short-lived cache, clearing out expired entries
+    and the oldest ones if it grows past FLIGHT_CACHE_MAXSIZE.
+    """
+    now = time.time()
+    for k in [k for k, (ts, _) in _flight_cache.items() if now - ts >= FLIGHT_CACHE_TTL]:
+        del _flight_cache[k]
+    while len(_flight_cache) >= FLIGHT_CACHE_MAXSIZE:
+        del _flight_cache[next(iter(_flight_cache))]
+    _flight_cache[key] = (now, result)
 
 def get_flights_around_location(
     latitude: float,
@@ -186,6 +300,9 @@ def get_flights_around_location(
         longitude (float): The longitude of your current location.
         radius_km (float): The radius in kilometers around your location to search for flights.
 
+    Successful results are cached for FLIGHT_CACHE_TTL seconds per rounded location and
+    radius, so repeat requests from the same area reuse the last answer.
+
     Returns:
         str: A string containing a summary of airborne flights found, including their
              callsign, country, position, altitude, speed, heading,
@@ -193,6 +310,11 @@ def get_flights_around_location(
              Returns an informative error message if the API request fails or
              no airborne flights are found.
     """
+    cache_key = (round(latitude, 2), round(longitude, 2), round(radius_km))
+    cached = _flight_cache.get(cache_key)
+    if cached and time.time() - cached[0] < FLIGHT_CACHE_TTL:
+        return cached[1]
+
     # --- Hardcoded Credentials ---
     # As requested, credentials are hardcoded here.
     # WARNING: This is not a recommended security practice for most applications.
@@ -206,9 +328,6 @@ def get_flights_around_location(
         return ("Authentication failed. Could not retrieve access token from OpenSky. "
                 "Please check your hardcoded client_id and client_secret.")
 
-    # Initialize a cache for aircraft metadata to reduce API calls within a single run.
-    aircraft_metadata_cache = {}
-
     # Earth's approximate radius in kilometers for calculations.
     R_earth = 6371
 
@@ -237,9 +356,9 @@ def get_flights_around_location(
     headers = {"Authorization": f"Bearer {token}"}
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = _session.get(url, params=params, headers=headers, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         if not data or not data.get("states"):
             return (f"No flight information found within {radius_km} km radius around "
@@ -247,87 +366,76 @@ def get_flights_around_location(
                     f"The OpenSky Network might not have data for this area or period, "
                     f"or the API returned an empty set.")
 
-        flight_details = []
-        for s in data["states"]:
-            icao24 = s[0]
-            callsign = s[1].strip() if s[1] else "N/A"
-            origin_country = s[2]
-            last_contact_timestamp = s[4]
-            current_longitude = s[5]
-            current_latitude = s[6]
-            baro_altitude_meters = s[7]
-            on_ground = s[8]
-            velocity_mps = s[9]
-            heading_degrees = s[10]
-            
-            category_code = s[17] if len(s) > 17 and s[17] is not None else None
+        # Only airborne aircraft with a known position are reported.
+        airborne_states = [s for s in data["states"] if not s[8] and s[5] is not None and s[6] is not None]
+
+        # Calculate distance and bearing from your location for every aircraft at once.
+        lons = np.array([s[5] for s in airborne_states], dtype=float)
+        lats = np.array([s[6] for s in airborne_states], dtype=float)
+        if numba is not None and len(airborne_states) > NUMBA_MIN_FLIGHTS:
+            distances = np.empty_like(lats)
+            bearings = np.empty_like(lats)
+            _dist_brg(latitude, longitude, lats, lons, distances, bearings)
+        else:
+            obs = Observer(latitude, longitude)
+            distances, bearings = obs.distance_and_bearing_to(lats, lons)
+
+        # The bounding box is a square, drop the aircraft in its corners that are outside the
+        # requested radius before paying for any metadata lookups on them.
+        in_radius = distances <= radius_km
+        airborne_states = [s for s, keep in zip(airborne_states, in_radius.tolist()) if keep]
+        distances = distances[in_radius].tolist()
+        bearings = bearings[in_radius].tolist()
+
+        # Fetch aircraft make and model for every unique airborne aircraft in parallel.
+        # Each lookup can be an HTTP round-trip, so doing them one at a time adds up quickly.
+        airborne_icao24s = list({s[0] for s in airborne_states})
+        with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as executor:
+            aircraft_models = dict(zip(airborne_icao24s, executor.map(get_aircraft_metadata, airborne_icao24s)))
+
+        # (distance, formatted details) for each flight, built in a single pass
+        flights_out = []
+        for s, distance_from_me, bearing_from_me in zip(airborne_states, distances, bearings):
+            (icao24, callsign_raw, origin_country, last_contact_timestamp, current_longitude,
+             current_latitude, baro_altitude_meters, velocity_mps, heading_degrees) = _unpack_state(s)
+            callsign = callsign_raw.strip() if callsign_raw else "N/A"
+            category_code = s[17] if len(s) > 17 else None
             
-            category_str = AIRCRAFT_CATEGORIES.get(category_code, 'Unknown Type')
-            is_helicopter = (category_code == 8)
+            if category_code is not None and 0 <= category_code < len(AIRCRAFT_CATEGORIES):
+                category_str = AIRCRAFT_CATEGORIES[category_code]
+            else:
+                category_str = 'Unknown Type'
 
             # Destination airport is disabled for free trial
             destination_airport = "unavailable (due to free trial limitations)"
 
-            # Fetch aircraft make and model.
-            # NOTE: This makes an additional API call per unique aircraft, which can increase latency.
-            # A cache is used to prevent duplicate lookups during this run.
-            model_info = get_aircraft_metadata(icao24, aircraft_metadata_cache)
-
-            if on_ground:
-                continue
-
-            altitude_feet = (baro_altitude_meters * 3.28084) if baro_altitude_meters is not None else None
-            velocity_kmh = (velocity_mps * 3.6) if velocity_mps is not None else None
-            last_contact_str = datetime.fromtimestamp(last_contact_timestamp).strftime('%Y-%m-%d %H:%M:%S UTC')
-
-            # Calculate distance and bearing from your location
-            distance_from_me = haversine_distance(latitude, longitude, current_latitude, current_longitude)
-            bearing_from_me = calculate_bearing(latitude, longitude, current_latitude, current_longitude)
-
-            flight_details.append({
-                "callsign": callsign,
-                "icao24": icao24,
-                "origin_country": origin_country,
-                "model_info": model_info,
-                "category_str": category_str,
-                "is_helicopter": is_helicopter,
-                "last_contact_str": last_contact_str,
-                "current_latitude": current_latitude,
-                "current_longitude": current_longitude,
-                "altitude_feet": altitude_feet,
-                "velocity_kmh": velocity_kmh,
-                "heading_degrees": heading_degrees,
-                "distance_from_me": distance_from_me,
-                "bearing_from_me": bearing_from_me,
-            })
-
-        if not flight_details:
-            return (f"No airborne flight information found within {radius_km} km radius around "
-                    f"({latitude:.4f}, {longitude:.4f}) at this time. "
-                    f"All detected aircraft might be on the ground or no data is available.")
-
-        # Sort flights by distance (closest first). Handle None for distance gracefully.
-        flight_details.sort(key=lambda f: f['distance_from_me'] if f['distance_from_me'] is not None else float('inf'))
+            model_info = aircraft_models[icao24]
 
-        # Build the formatted string output from the sorted list
-        output_strings = []
-        for flight in flight_details:
-            altitude_str = f"{flight['altitude_feet']:.0f}" if flight['altitude_feet'] is not None else "N/A"
-            velocity_str = f"{flight['velocity_kmh']:.0f}" if flight['velocity_kmh'] is not None else "N/A"
-            heading_str = f"{flight['heading_degrees']:.1f}" if flight['heading_degrees'] is not None else "N/A"
-            distance_str = f"{flight['distance_from_me']:.2f}" if flight['distance_from_me'] is not None else "N/A"
-            bearing_degrees_str = f"{flight['bearing_from_me']:.1f}°" if flight['bearing_from_me'] is not None else "N/A"
-            bearing_cardinal_str = degrees_to_cardinal(flight['bearing_from_me'])
+            altitude_str = f"{baro_altitude_meters * 3.28084:.0f}" if baro_altitude_meters is not None else "N/A"
+            velocity_str = f"{velocity_mps * 3.6:.0f}" if velocity_mps is not None else "N/A"
+            heading_str = f"{heading_degrees:.1f}" if heading_degrees is not None else "N/A"
 
+            # Distance and bearing are always known here, so format them directly and skip the
+            # None check in degrees_to_cardinal.
             detail = (
-                f"  - Callsign: {flight['callsign']}, ICAO24: {flight['icao24']}, Country: {flight['origin_country']}\n"
-                f"    Distance from you: {distance_str} km, Look in this direction: {bearing_cardinal_str} ({bearing_degrees_str})\n"
-                f"    Model: {flight['model_info']}\n"
-                f"    Type: {flight['category_str']}{' 🚁' if flight['is_helicopter'] else ' ✈️'}\n"
-                f"    Position: Lat {flight['current_latitude']:.4f}, Lon {flight['current_longitude']:.4f}\n"
+                f"  - Callsign: {callsign}, ICAO24: {icao24}, Country: {origin_country}\n"
+                f"    Distance from you: {distance_from_me:.2f} km, Look in this direction: "
+                f"{_cardinal(bearing_from_me)} ({bearing_from_me:.1f}°)\n"
+                f"    Model: {model_info}\n"
+                f"    Type: {category_str}{_HELI_EMOJI if category_code == 8 else _PLANE_EMOJI}\n"
+                f"    Position: Lat {current_latitude:.4f}, Lon {current_longitude:.4f}\n"
                 f"    Altitude: {altitude_str} feet, Speed: {velocity_str} km/h, Heading: {heading_str}°\n"
             )
-            output_strings.append(detail)
+            flights_out.append((distance_from_me, detail))
+
+        if not flights_out:
+            return (f"No airborne flight information found within {radius_km} km radius around "
+                    f"({latitude:.4f}, {longitude:.4f}) at this time. "
+                    f"All detected aircraft might be on the ground or no data is available.")
+
+        # Sort flights by distance (closest first) and keep the formatted strings in that order.
+        flights_out.sort(key=itemgetter(0))
+        output_strings = [detail for _, detail in flights_out]
 
         summary_string = (
             f"Flight information within {radius_km} km radius of your location "
@@ -335,10 +443,13 @@ def get_flights_around_location(
             f"Total airborne flights found: {len(output_strings)}\n\n" +
             "\n".join(output_strings)
         )
+        _store_flight_result(cache_key, summary_string)
         return summary_string
 
     except requests.exceptions.HTTPError as http_err:
         if http_err.response.status_code == 401:
+            # Drop the cached token so the next request fetches a fresh one.
+            _token["value"] = None
             return ("HTTP error 401: Unauthorized. Your access token may be invalid or expired. "
                     "This can happen if your hardcoded client credentials are wrong or the token has timed out (30 mins).")
         else:
@@ -553,7 +553,7 @@ async def on_ready():
     await botFunctions.tealMessage(f"""👋Good day!\n💬Feel free to start chatting!\n🙏Done with the conversation? Just say 'thanks' somewhere in your message.\n\n
         🔎Need current info? Say the words 'search' and 'please' somewhere in your message.\n🖼️Want a picture or four? Mention the word 'picture' and 'generate' 
         and describe what you'd like to see, as well as how many.\n\n📲If you want to see more commands, just type !help\n\n
-        ✅Get reminded and encouraged to do your habits by using !addhabit and !myhabits to check status/streaks (restart bot after adding habit)
+        ✅Get reminded and encouraged to do your habits by using !addhabit and !myhabits to check status/streaks
         🤖AI Models Available: \n!nano - GPT-4.1-nano\n!gpt4 - GPT-4.1\n!llm - {lmStudioModel}\n!groq - llama 3 70B""",main_channel_id_object)
     if is_port_listening(lmstudioIP,lmstudioPort) == True:
         await botFunctions.blackMessage(f"🟢 Local model {lmStudioModel} is currently online.", main_channel_id_object)
@@ -631,6 +631,14 @@ async def on_ready():
         askingAboutHabits = 1
         user_habit_data[user_id] = (habit_name, current_streak)
 
+    async def checkHabitReminders():
+        now_hhmm = datetime.now(time_zone).strftime('%H%M')
+        for user_id, habit_name in database.get_habits_due(now_hhmm):
+            try:
+                await habitReminders(user_id, habit_name)
+            except Exception as e:
+                print(f"Error sending reminder for {habit_name}: {e}")
+
     # Start the scheduler
     if notifications == 1:
         scheduler.start()
@@ -638,18 +646,9 @@ async def on_ready():
         # scheduler.add_job(daily_weather, 'cron', hour=7, minute=45, timezone=time_zone)
         # scheduler.add_job(gratitudes, 'cron', hour=21, minute=30, timezone=time_zone)
         
-        # New code for dynamic habit reminders
-        habits = database.get_all_habits_with_times()
-        #print(habits)
-        for habit in habits:
-            user_id, habit_name, reminder_time, streak = habit
-            try:
-                hour = int(reminder_time[:2])
-                minute = int(reminder_time[2:])
-                print(f"Adding habit: {habit_name} for {user_id} at {hour}:{minute}")
-                scheduler.add_job(habitReminders, 'cron', hour=hour, minute=minute, args=[user_id, habit_name], timezone=time_zone)
-            except Exception as e:
-                print(f"Error scheduling reminder for {habit_name}: {e}")
+        # Dynamic habit reminders, check every minute for habits due right now.
+        # Only the matching habits come back from the database, and new habits get picked up without a restart.
+        scheduler.add_job(checkHabitReminders, 'cron', minute='*', timezone=time_zone)
 # function that runs on event, so whenever you send something to the bot
 @client.event
 async def on_message(message):
@@ -965,7 +964,7 @@ async def on_message(message):
             There are many commands as well:\n""", message.channel)
         await botFunctions.blackMessage(f"""**Summarize an article or youtube video:**\n
             Simply paste the youtube or article url into chat and hit enter. In the case of youtube it will pull the transcript and summarize it. You can then talk to the results by using the !16k flag to ensure you have the tokens to do so\n
-            **!addhabit** - Add a habit reminder, keeps track of streaks and encourages you! (restart bot after adding habit)\n
+            **!addhabit** - Add a habit reminder, keeps track of streaks and encourages you!\n
             **!myhabits** - lists current habits\n
             **!braintrust** - dynamically makes  bunch of 'professional' identity's to answer your question\n
             **!ignore** - the bot won't react at all, so just in case you want to save yourself a message for later or something\n